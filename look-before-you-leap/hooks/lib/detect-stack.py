@@ -11,44 +11,96 @@ import json
 import os
 import sys
 
+# orjson is optional: several times faster on large monorepos, stdlib otherwise
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Workspace parent directories scanned one level deep in monorepos
+WORKSPACE_PARENTS = ("apps", "packages", "services", "libs")
+
+# Detected languages that never use the JS workspace tooling
+NON_JS_LANGUAGES = ("rust", "python", "go")
+
+# apps/<name> directories recognised as the API and web app
+API_APP_NAMES = frozenset({"api", "server", "backend"})
+WEB_APP_NAMES = frozenset({"web", "app", "client", "frontend"})
 
 def read_json(path):
     try:
-        with open(path) as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        with open(path, "rb") as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
         return None
 
 
-def file_exists(path):
-    return os.path.isfile(path)
+def _scan_root(root):
+    """Return the names of regular files directly under root.
+
+    One readdir answers every root-level marker probe (lockfiles,
+    tsconfig, manifests) instead of a stat per candidate.
+    """
+    try:
+        with os.scandir(root) as it:
+            return frozenset(entry.name for entry in it if entry.is_file())
+    except OSError:
+        return frozenset()
+
 
+def _list_subdirs(path):
+    """Return the subdirectory entries of path sorted by name ([] if unreadable)."""
+    try:
+        with os.scandir(path) as it:
+            return sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    except OSError:
+        return []
 
-def dir_exists(path):
-    return os.path.isdir(path)
 
+def _scan_workspace(path):
+    """Return (pkg, has_tsconfig) for one workspace directory.
 
-def detect_language(root):
-    """Detect primary language."""
-    if file_exists(f"{root}/tsconfig.json") or file_exists(f"{root}/tsconfig.base.json"):
+    A single readdir tells us whether tsconfig.json and package.json exist;
+    package.json is only opened when present.
+    """
+    try:
+        with os.scandir(path) as it:
+            names = {entry.name for entry in it if entry.is_file()}
+    except OSError:
+        return None, False
+    pkg = read_json(path + "/package.json") if "package.json" in names else None
+    return pkg, "tsconfig.json" in names
+
+
+def load_workspaces(root):
+    """Scan every workspace one level under the known parents, in one pass.
+
+    Returns a tuple of (workspace_parent, entry_name, pkg, has_tsconfig)
+    records, sorted by entry name within each parent. pkg is None when the
+    package.json is missing or unparseable.
+    """
+    prefix = root + "/"
+    return tuple(
+        (workspace_parent, entry.name) + _scan_workspace(entry.path)
+        for workspace_parent in WORKSPACE_PARENTS
+        for entry in _list_subdirs(prefix + workspace_parent)
+    )
+
+
+def detect_language(root_files, workspaces):
+    """Detect primary language from root file names and workspace scan."""
+    if "tsconfig.json" in root_files or "tsconfig.base.json" in root_files:
         return "typescript"
     # Check workspace subdirectories for tsconfig (monorepos often skip root tsconfig)
-    for parent in ("apps", "packages", "services", "libs"):
-        parent_dir = f"{root}/{parent}"
-        if dir_exists(parent_dir):
-            try:
-                for entry in os.listdir(parent_dir):
-                    if file_exists(f"{parent_dir}/{entry}/tsconfig.json"):
-                        return "typescript"
-            except OSError:
-                pass
-    if file_exists(f"{root}/package.json"):
+    if any(has_tsconfig for _, _, _, has_tsconfig in workspaces):
+        return "typescript"
+    if "package.json" in root_files:
         return "javascript"
-    if file_exists(f"{root}/Cargo.toml"):
+    if "Cargo.toml" in root_files:
         return "rust"
-    if file_exists(f"{root}/pyproject.toml") or file_exists(f"{root}/setup.py"):
+    if "pyproject.toml" in root_files or "setup.py" in root_files:
         return "python"
-    if file_exists(f"{root}/go.mod"):
+    if "go.mod" in root_files:
         return "go"
     return ""
 
@@ -61,36 +113,33 @@ def detect_runtime(language, package_manager):
     return ""
 
 
-def detect_package_manager(root):
-    if file_exists(f"{root}/pnpm-lock.yaml"):
+def detect_package_manager(root_files):
+    if "pnpm-lock.yaml" in root_files:
         return "pnpm"
-    if file_exists(f"{root}/bun.lockb") or file_exists(f"{root}/bun.lock"):
+    if "bun.lockb" in root_files or "bun.lock" in root_files:
         return "bun"
-    if file_exists(f"{root}/yarn.lock"):
+    if "yarn.lock" in root_files:
         return "yarn"
-    if file_exists(f"{root}/package-lock.json"):
+    if "package-lock.json" in root_files:
         return "npm"
     return ""
 
 
-def detect_monorepo(root):
-    indicators = [
-        f"{root}/pnpm-workspace.yaml",
-        f"{root}/turbo.json",
-        f"{root}/lerna.json",
-        f"{root}/nx.json",
-    ]
-    for path in indicators:
-        if file_exists(path):
-            return True
-    # Check package.json workspaces field
-    pkg = read_json(f"{root}/package.json")
-    if pkg and "workspaces" in pkg:
-        return True
-    return False
-
-
-def collect_all_deps(root):
+def detect_monorepo(root_files, root_pkg, maybe_js=True):
+    # Workspace tooling detected here is all JS/TS; skip the probes otherwise
+    if not maybe_js:
+        return False
+    return (
+        "pnpm-workspace.yaml" in root_files
+        or "turbo.json" in root_files
+        or "lerna.json" in root_files
+        or "nx.json" in root_files
+        # package.json workspaces field
+        or bool(root_pkg and "workspaces" in root_pkg)
+    )
+
+
+def collect_all_deps(root_pkg, workspaces):
     """Collect all dependency names from package.json (and workspace package.jsons)."""
     all_deps = set()
 
@@ -102,131 +151,118 @@ def collect_all_deps(root):
             if isinstance(deps, dict):
                 all_deps.update(deps.keys())
 
-    # Root package.json
-    add_deps_from(read_json(f"{root}/package.json"))
-
-    # Scan workspace dirs one level deep
-    for workspace_parent in ("apps", "packages", "services", "libs"):
-        parent = f"{root}/{workspace_parent}"
-        if not dir_exists(parent):
-            continue
-        try:
-            for entry in os.listdir(parent):
-                pkg_path = f"{parent}/{entry}/package.json"
-                add_deps_from(read_json(pkg_path))
-        except OSError:
-            pass
+    add_deps_from(root_pkg)
+    for _, _, pkg, _ in workspaces:
+        add_deps_from(pkg)
 
     return all_deps
 
 
+# Dependency -> framework/tool name, in priority order (first match wins)
+FRONTEND_MAP = (
+    ("react", "react"), ("react-dom", "react"),
+    ("next", "next"),
+    ("vue", "vue"), ("nuxt", "nuxt"),
+    ("svelte", "svelte"), ("@sveltejs/kit", "sveltekit"),
+    ("solid-js", "solid"),
+    ("@angular/core", "angular"),
+)
+
+BACKEND_MAP = (
+    ("hono", "hono"),
+    ("express", "express"),
+    ("fastify", "fastify"),
+    ("@nestjs/core", "nestjs"),
+    ("koa", "koa"),
+)
+
+VALIDATION_MAP = (
+    ("zod", "zod"),
+    ("valibot", "valibot"),
+    ("joi", "joi"),
+    ("yup", "yup"),
+    ("ajv", "ajv"),
+)
+
+STYLING_MAP = (
+    ("tailwindcss", "tailwind"),
+    ("@tailwindcss/postcss", "tailwind"),
+    ("styled-components", "styled-components"),
+    ("@emotion/react", "emotion"),
+)
+
+TESTING_MAP = (
+    ("vitest", "vitest"),
+    ("jest", "jest"),
+    ("@playwright/test", "playwright"),
+    ("cypress", "cypress"),
+    ("mocha", "mocha"),
+)
+
+ORM_MAP = (
+    ("drizzle-orm", "drizzle"),
+    ("prisma", "prisma"),
+    ("@prisma/client", "prisma"),
+    ("convex", "convex"),
+    ("typeorm", "typeorm"),
+    ("sequelize", "sequelize"),
+    ("kysely", "kysely"),
+    ("mongoose", "mongoose"),
+)
+
+CODE_QUALITY_MAP = (
+    ("knip", "knip"),
+)
+
+
+# Category -> priority map, in the order categories appear in the stack block
+DEP_CATEGORIES = (
+    ("frontend", FRONTEND_MAP),
+    ("backend", BACKEND_MAP),
+    ("validation", VALIDATION_MAP),
+    ("styling", STYLING_MAP),
+    ("testing", TESTING_MAP),
+    ("orm", ORM_MAP),
+    ("code_quality", CODE_QUALITY_MAP),
+)
+
+# dep -> (category, name, priority) merged from all maps; lower priority wins.
+# Every dep must belong to exactly one category (checked in test_detect_stack.py).
+DEP_INDEX = {
+    dep: (category, name, priority)
+    for category, mapping in DEP_CATEGORIES
+    for priority, (dep, name) in enumerate(mapping)
+}
+
+
 def detect_from_deps(deps, root_scripts=None, package_manager=""):
     """Detect frameworks/tools from dependency names."""
-    result = {}
     scripts = root_scripts or {}
 
-    # Frontend
-    frontend_map = {
-        "react": "react", "react-dom": "react",
-        "next": "next",
-        "vue": "vue", "nuxt": "nuxt",
-        "svelte": "svelte", "@sveltejs/kit": "sveltekit",
-        "solid-js": "solid",
-        "@angular/core": "angular",
-    }
-    for dep, name in frontend_map.items():
-        if dep in deps:
-            result["frontend"] = name
-            break
-
-    # Backend
-    backend_map = {
-        "hono": "hono",
-        "express": "express",
-        "fastify": "fastify",
-        "@nestjs/core": "nestjs",
-        "koa": "koa",
-    }
-    # next is both frontend and backend
-    if "next" in deps and "frontend" not in result:
-        result["backend"] = "next"
-    for dep, name in backend_map.items():
-        if dep in deps:
-            result["backend"] = name
-            break
-
-    # Validation
-    validation_map = {
-        "zod": "zod",
-        "valibot": "valibot",
-        "joi": "joi",
-        "yup": "yup",
-        "ajv": "ajv",
-    }
-    for dep, name in validation_map.items():
-        if dep in deps:
-            result["validation"] = name
-            break
-
-    # Styling
-    styling_map = {
-        "tailwindcss": "tailwind",
-        "@tailwindcss/postcss": "tailwind",
-        "styled-components": "styled-components",
-        "@emotion/react": "emotion",
-    }
-    for dep, name in styling_map.items():
-        if dep in deps:
-            result["styling"] = name
-            break
-
-    # Testing — check deps first, then fall back to script patterns
-    testing_map = {
-        "vitest": "vitest",
-        "jest": "jest",
-        "@playwright/test": "playwright",
-        "cypress": "cypress",
-        "mocha": "mocha",
-    }
-    for dep, name in testing_map.items():
-        if dep in deps:
-            result["testing"] = name
-            break
-    # If no testing dep found, check if scripts use bun test
-    if "testing" not in result and package_manager == "bun":
-        test_script = scripts.get("test", "")
-        if "bun test" in test_script or "bun run test" in test_script:
-            result["testing"] = "bun-test"
-
-    # ORM / DB
-    orm_map = {
-        "drizzle-orm": "drizzle",
-        "prisma": "prisma",
-        "@prisma/client": "prisma",
-        "convex": "convex",
-        "typeorm": "typeorm",
-        "sequelize": "sequelize",
-        "kysely": "kysely",
-        "mongoose": "mongoose",
-    }
-    for dep, name in orm_map.items():
-        if dep in deps:
-            result["orm"] = name
-            break
-
-    # Code quality
-    code_quality_map = {
-        "knip": "knip",
-    }
-    for dep, name in code_quality_map.items():
-        if dep in deps:
-            result["code_quality"] = name
-            break
+    # Single pass over the known deps actually present
+    best = {}
+    for dep in deps.intersection(DEP_INDEX):
+        category, name, priority = DEP_INDEX[dep]
+        if category not in best or priority < best[category][0]:
+            best[category] = (priority, name)
+
+    result = {}
+    for category, _ in DEP_CATEGORIES:
+        if category in best:
+            result[category] = best[category][1]
+        # next is both frontend and backend
+        elif category == "backend" and "next" in deps and "frontend" not in result:
+            result["backend"] = "next"
+        # Testing — no dep found, fall back to script patterns
+        elif category == "testing" and package_manager == "bun":
+            test_script = scripts.get("test", "")
+            if "bun test" in test_script or "bun run test" in test_script:
+                result["testing"] = "bun-test"
 
     return result
 
 
-def detect_structure(root, is_monorepo):
+def detect_structure(workspaces, is_monorepo):
     """Detect project structure for monorepos."""
     if not is_monorepo:
         return {}
@@ -234,35 +270,27 @@ def detect_structure(root, is_monorepo):
     structure = {}
     shared_packages = []
 
-    # Scan apps/ and packages/ for package names
-    for workspace_parent in ("apps", "packages", "services", "libs"):
-        parent = f"{root}/{workspace_parent}"
-        if not dir_exists(parent):
+    for workspace_parent, entry, pkg, _ in workspaces:
+        if not pkg:
             continue
-        try:
-            for entry in sorted(os.listdir(parent)):
-                pkg = read_json(f"{parent}/{entry}/package.json")
-                if not pkg:
-                    continue
-                name = pkg.get("name", "")
-                entry_path = f"{workspace_parent}/{entry}"
-
-                if workspace_parent == "packages":
-                    # Heuristic: if the package looks like a shared API package
-                    if "api" in entry.lower():
-                        structure["shared_api_package"] = name
-                        structure["shared_dir"] = entry_path
-                    # Collect all shared packages
-                    if name:
-                        shared_packages.append(entry_path)
-
-                elif workspace_parent == "apps":
-                    if entry.lower() in ("api", "server", "backend"):
-                        structure["api_dir"] = entry_path
-                    elif entry.lower() in ("web", "app", "client", "frontend"):
-                        structure["web_dir"] = entry_path
-        except OSError:
-            pass
+        name = pkg.get("name", "")
+        entry_path = f"{workspace_parent}/{entry}"
+        entry_lower = entry.lower()
+
+        if workspace_parent == "packages":
+            # Heuristic: if the package looks like a shared API package
+            if "api" in entry_lower:
+                structure["shared_api_package"] = name
+                structure["shared_dir"] = entry_path
+            # Collect all shared packages
+            if name:
+                shared_packages.append(entry_path)
+
+        elif workspace_parent == "apps":
+            if entry_lower in API_APP_NAMES:
+                structure["api_dir"] = entry_path
+            elif entry_lower in WEB_APP_NAMES:
+                structure["web_dir"] = entry_path
 
     if shared_packages:
         structure["shared_packages"] = shared_packages
@@ -275,48 +303,56 @@ def should_enable_api_contracts(detected):
     return bool(detected.get("backend"))
 
 
-def detect_verification_commands(root):
+# Well-known script names -> verification category, in priority order
+# (the first script present wins its category)
+SCRIPT_MAP = {
+    "typecheck": "typecheck", "type-check": "typecheck", "tsc": "typecheck",
+    "tsgo": "typecheck", "check-types": "typecheck",
+    "lint": "lint", "eslint": "lint",
+    "test": "test", "test:unit": "test",
+    "build": "build",
+}
+SCRIPT_PRIORITY = {name: i for i, name in enumerate(SCRIPT_MAP)}
+
+
+def detect_verification_commands(root_pkg):
     """Extract verification commands from root package.json scripts."""
-    pkg = read_json(f"{root}/package.json")
-    if not pkg:
+    if not root_pkg:
         return {}
 
-    scripts = pkg.get("scripts", {})
-    if not scripts:
+    scripts = root_pkg.get("scripts", {})
+    if not scripts or not isinstance(scripts, dict):
         return {}
 
     commands = {}
-
-    # Map well-known script names to verification categories
-    script_map = {
-        "typecheck": "typecheck", "type-check": "typecheck", "tsc": "typecheck",
-        "tsgo": "typecheck", "check-types": "typecheck",
-        "lint": "lint", "eslint": "lint",
-        "test": "test", "test:unit": "test",
-        "build": "build",
-    }
-
-    for script_name, category in script_map.items():
-        if script_name in scripts and category not in commands:
-            commands[category] = f"{script_name}"
+    for script_name in sorted(scripts.keys() & SCRIPT_MAP.keys(), key=SCRIPT_PRIORITY.get):
+        commands.setdefault(SCRIPT_MAP[script_name], script_name)
 
     return commands
 
 
 def build_config(root):
-    language = detect_language(root)
-    package_manager = detect_package_manager(root)
+    # Scan the root and the workspaces once; every detector reads these results
+    root_files = _scan_root(root)
+    workspaces = load_workspaces(root)
+
+    language = detect_language(root_files, workspaces)
+    package_manager = detect_package_manager(root_files)
     runtime = detect_runtime(language, package_manager)
-    is_monorepo = detect_monorepo(root)
+    is_js = language in ("typescript", "javascript")
+    # An undetected language ("") can still be a JS workspace root with no
+    # root package.json or tsconfig, so only known non-JS languages skip
+    maybe_js = language not in NON_JS_LANGUAGES
 
-    root_pkg = read_json(f"{root}/package.json")
+    root_pkg = read_json(root + "/package.json") if maybe_js else None
     root_scripts = root_pkg.get("scripts", {}) if root_pkg else {}
+    is_monorepo = detect_monorepo(root_files, root_pkg, maybe_js)
 
-    deps = collect_all_deps(root) if language in ("typescript", "javascript") else set()
+    deps = collect_all_deps(root_pkg, workspaces) if is_js else set()
     from_deps = detect_from_deps(deps, root_scripts, package_manager)
 
-    structure = detect_structure(root, is_monorepo)
-    verification = detect_verification_commands(root)
+    structure = detect_structure(workspaces, is_monorepo)
+    verification = detect_verification_commands(root_pkg) if maybe_js else {}
 
     stack = {}
     if language:
@@ -337,7 +373,7 @@ def build_config(root):
 
 
 def render_config(stack, structure, disciplines, verification):
-    """Render the full .local.md file content."""
+    """Render the full .local.md file content as UTF-8 bytes."""
     lines = ["---"]
 
     if stack:
@@ -372,7 +408,7 @@ def render_config(stack, structure, disciplines, verification):
     lines.append("Add project-specific context here (optional, free-form).")
     lines.append("")
 
-    return "\n".join(lines)
+    return "\n".join(lines).encode()
 
 
 def _yaml_val(v):
@@ -388,7 +424,7 @@ def main():
 
     root = sys.argv[1].rstrip("/")
     stack, structure, disciplines, verification = build_config(root)
-    print(render_config(stack, structure, disciplines, verification), end="")
+    sys.stdout.buffer.write(render_config(stack, structure, disciplines, verification))
 
 
 if __name__ == "__main__":
@@ -12,6 +12,14 @@ import json
 import re
 import sys
 
+_FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---', re.DOTALL)
+_LIST_RE = re.compile(r'^\s+-\s+(.+)')
+_CHILD_RE = re.compile(r'^\s+([\w_]+)\s*:\s*(.*)')
+_TOP_RE = re.compile(r'^([\w_]+)\s*:\s*(.*)')
+
+# Frontmatter is only ever a few hundred bytes; never read note bodies past this
+MAX_FRONTMATTER_BYTES = 64 * 1024
+
 
 def parse_frontmatter(text):
     """Extract YAML frontmatter from markdown text.
@@ -23,11 +31,11 @@ def parse_frontmatter(text):
 
     Values are coerced: true/false -> bool, digits -> int.
     """
-    match = re.match(r'^---\s*\n(.*?)\n---', text, re.DOTALL)
+    match = _FRONTMATTER_RE.match(text)
     if not match:
         return {}
 
-    lines = match.group(1).split('\n')
+    lines = match.group(1).splitlines()
     result = {}
     current_parent = None
     current_child_list = None  # (parent_key, child_key) when collecting list items
@@ -41,7 +49,7 @@ def parse_frontmatter(text):
             continue
 
         # List item (e.g. "    - packages/i18n")
-        list_match = re.match(r'^\s+-\s+(.+)', line)
+        list_match = _LIST_RE.match(line)
         if list_match and current_child_list:
             parent_key, child_key = current_child_list
             result[parent_key][child_key].append(_coerce(list_match.group(1).strip()))
@@ -52,7 +60,7 @@ def parse_frontmatter(text):
 
         # Indented line (child of current parent)
         if line.startswith('  ') and current_parent is not None:
-            child_match = re.match(r'^\s+([\w_]+)\s*:\s*(.*)', line)
+            child_match = _CHILD_RE.match(line)
             if child_match:
                 key, val = child_match.group(1), child_match.group(2).strip()
                 if val:
@@ -64,7 +72,7 @@ def parse_frontmatter(text):
             continue
 
         # Top-level key
-        top_match = re.match(r'^([\w_]+)\s*:\s*(.*)', line)
+        top_match = _TOP_RE.match(line)
         if top_match:
             key, val = top_match.group(1), top_match.group(2).strip()
             if val:
@@ -80,6 +88,20 @@ def parse_frontmatter(text):
     return result
 
 
+def read_frontmatter_text(path):
+    """Return the leading chunk of path, or '' if it has no frontmatter marker.
+
+    Peeks at the first bytes so files without a leading '---' are never read
+    in full, and caps the read at MAX_FRONTMATTER_BYTES otherwise.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(3)
+        if head != b'---':
+            return ''
+        data = head + f.read(MAX_FRONTMATTER_BYTES - len(head))
+    return data.decode('utf-8', errors='replace')
+
+
 def _coerce(val):
     """Coerce string values to bool/int where appropriate."""
     if val.lower() == 'true':
@@ -104,9 +126,7 @@ def main():
     config_path = f"{project_root}/.claude/look-before-you-leap.local.md"
 
     try:
-        with open(config_path) as f:
-            content = f.read()
-        config = parse_frontmatter(content)
+        config = parse_frontmatter(read_frontmatter_text(config_path))
         json.dump(config, sys.stdout)
     except (FileNotFoundError, PermissionError, OSError):
         json.dump({}, sys.stdout)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Tests for hooks/lib/detect-stack.py — stack, structure and script detection."""
+
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[1]
+DETECT_STACK = PLUGIN_ROOT / "hooks" / "lib" / "detect-stack.py"
+
+# detect-stack.py has a hyphen in its name, so load it by path
+_spec = importlib.util.spec_from_file_location("detect_stack", DETECT_STACK)
+detect_stack = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(detect_stack)
+
+
+class DetectStackTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, rel_path, content=""):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content if isinstance(content, str) else json.dumps(content))
+
+
+class TestLoadWorkspaces(DetectStackTestCase):
+    def test_sorted_per_parent_and_skips_files(self):
+        self.write("packages/b/package.json", {"name": "b"})
+        self.write("packages/a/package.json", {"name": "a"})
+        self.write("packages/README.md", "not a workspace")
+        self.write("apps/web/package.json", {"name": "web"})
+
+        workspaces = detect_stack.load_workspaces(self.root)
+
+        self.assertEqual(
+            [(parent, entry) for parent, entry, _, _ in workspaces],
+            [("apps", "web"), ("packages", "a"), ("packages", "b")],
+        )
+
+    def test_missing_or_invalid_package_json_is_none(self):
+        self.write("libs/broken/package.json", "{not json")
+        os.makedirs(os.path.join(self.root, "libs", "empty"))
+
+        workspaces = detect_stack.load_workspaces(self.root)
+
+        self.assertEqual(
+            workspaces,
+            (("libs", "broken", None, False), ("libs", "empty", None, False)),
+        )
+
+    def test_records_tsconfig_presence(self):
+        self.write("apps/web/package.json", {"name": "web"})
+        self.write("apps/web/tsconfig.json", "{}")
+        self.write("apps/docs/package.json", {"name": "docs"})
+
+        workspaces = detect_stack.load_workspaces(self.root)
+
+        self.assertEqual(workspaces, (
+            ("apps", "docs", {"name": "docs"}, False),
+            ("apps", "web", {"name": "web"}, True),
+        ))
+
+    def test_no_workspace_parents(self):
+        self.assertEqual(detect_stack.load_workspaces(self.root), ())
+
+
+class TestDetectFromDeps(unittest.TestCase):
+    def test_each_dep_in_exactly_one_category(self):
+        # A dep listed in two maps would silently overwrite itself in DEP_INDEX
+        self.assertEqual(
+            len(detect_stack.DEP_INDEX),
+            sum(len(mapping) for _, mapping in detect_stack.DEP_CATEGORIES),
+        )
+
+    def test_priority_order_within_category(self):
+        deps = {"vue", "react-dom", "@prisma/client", "kysely", "cypress", "jest"}
+        self.assertEqual(detect_stack.detect_from_deps(deps), {
+            "frontend": "react",
+            "testing": "jest",
+            "orm": "prisma",
+        })
+
+    def test_bun_test_fallback_keeps_category_order(self):
+        result = detect_stack.detect_from_deps(
+            {"drizzle-orm", "zod"}, {"test": "bun test"}, "bun"
+        )
+        self.assertEqual(list(result.items()), [
+            ("validation", "zod"), ("testing", "bun-test"), ("orm", "drizzle"),
+        ])
+
+
+class TestBuildConfig(DetectStackTestCase):
+    def test_monorepo(self):
+        self.write("package.json", {
+            "name": "root",
+            "scripts": {"lint": "eslint .", "type-check": "tsc", "tsc": "tsc"},
+            "devDependencies": {"vitest": "1"},
+        })
+        self.write("pnpm-workspace.yaml")
+        self.write("pnpm-lock.yaml")
+        self.write("apps/api/package.json", {
+            "name": "@m/api", "dependencies": {"hono": "1", "zod": "1"},
+        })
+        self.write("apps/web/package.json", {
+            "name": "@m/web", "dependencies": {"next": "1", "react": "1"},
+        })
+        self.write("apps/web/tsconfig.json", "{}")
+        self.write("packages/api-client/package.json", {"name": "@m/api-client"})
+        self.write("packages/ui/package.json", {"name": "@m/ui"})
+
+        stack, structure, disciplines, verification = detect_stack.build_config(self.root)
+
+        self.assertEqual(stack["language"], "typescript")
+        self.assertEqual(stack["package_manager"], "pnpm")
+        self.assertTrue(stack["monorepo"])
+        self.assertEqual(stack["frontend"], "react")
+        self.assertEqual(stack["backend"], "hono")
+        self.assertEqual(stack["validation"], "zod")
+        self.assertEqual(stack["testing"], "vitest")
+        self.assertEqual(structure, {
+            "api_dir": "apps/api",
+            "web_dir": "apps/web",
+            "shared_api_package": "@m/api-client",
+            "shared_dir": "packages/api-client",
+            "shared_packages": ["packages/api-client", "packages/ui"],
+        })
+        self.assertEqual(verification, {"typecheck": "type-check", "lint": "lint"})
+        self.assertTrue(disciplines["api_contracts"])
+
+    def test_single_package_bun(self):
+        self.write("package.json", {
+            "dependencies": {"next": "1"}, "scripts": {"test": "bun test"},
+        })
+        self.write("bun.lock")
+
+        stack, structure, _, verification = detect_stack.build_config(self.root)
+
+        self.assertEqual(stack["language"], "javascript")
+        self.assertEqual(stack["runtime"], "bun")
+        self.assertFalse(stack["monorepo"])
+        self.assertEqual(stack["frontend"], "next")
+        self.assertEqual(stack["testing"], "bun-test")
+        self.assertEqual(structure, {})
+        self.assertEqual(verification, {"test": "test"})
+
+    def test_non_js_project_skips_js_detection(self):
+        self.write("pyproject.toml")
+        self.write("nx.json", "{}")
+        self.write("apps/svc/package.json", {"name": "svc"})
+
+        stack, structure, _, verification = detect_stack.build_config(self.root)
+
+        self.assertEqual(stack["language"], "python")
+        self.assertFalse(stack["monorepo"])
+        self.assertEqual(structure, {})
+        self.assertEqual(verification, {})
+
+    def test_unknown_language_workspace_root_is_monorepo(self):
+        self.write("bun.lock")
+        self.write("pnpm-workspace.yaml")
+        self.write("packages/ui/package.json", {"name": "@m/ui"})
+
+        stack, structure, _, _ = detect_stack.build_config(self.root)
+
+        self.assertNotIn("language", stack)
+        self.assertTrue(stack["monorepo"])
+        self.assertEqual(structure, {"shared_packages": ["packages/ui"]})
+
+    def test_rerun_sees_fresh_filesystem(self):
+        detect_stack.build_config(self.root)
+        self.write("Cargo.toml")
+
+        stack, _, _, _ = detect_stack.build_config(self.root)
+
+        self.assertEqual(stack["language"], "rust")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for hooks/lib/read-config.py — frontmatter parsing and bounded reads."""
+
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[1]
+READ_CONFIG = PLUGIN_ROOT / "hooks" / "lib" / "read-config.py"
+
+# read-config.py has a hyphen in its name, so load it by path
+_spec = importlib.util.spec_from_file_location("read_config", READ_CONFIG)
+read_config = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(read_config)
+
+
+class TestParseFrontmatter(unittest.TestCase):
+    def test_nested_values_and_lists(self):
+        text = (
+            "---\n"
+            "stack:\n"
+            "  language: typescript\n"
+            "  monorepo: true\n"
+            "structure:\n"
+            "  shared_packages:\n"
+            "    - packages/ui\n"
+            "    - packages/api\n"
+            "---\n"
+            "# Notes\n"
+        )
+        self.assertEqual(read_config.parse_frontmatter(text), {
+            "stack": {"language": "typescript", "monorepo": True},
+            "structure": {"shared_packages": ["packages/ui", "packages/api"]},
+        })
+
+    def test_crlf_line_endings(self):
+        text = "---\r\nstack:\r\n  port: 3000\r\n---\r\n"
+        self.assertEqual(read_config.parse_frontmatter(text), {"stack": {"port": 3000}})
+
+    def test_no_leading_marker(self):
+        self.assertEqual(read_config.parse_frontmatter("# Notes\n---\na: 1\n---\n"), {})
+
+
+class TestReadFrontmatterText(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "config.md")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def test_without_marker_returns_empty(self):
+        self.write(b"# Just notes\n" * 1000)
+        self.assertEqual(read_config.read_frontmatter_text(self.path), "")
+
+    def test_read_is_bounded(self):
+        self.write(b"---\na: 1\n---\n" + b"x" * (2 * read_config.MAX_FRONTMATTER_BYTES))
+        text = read_config.read_frontmatter_text(self.path)
+
+        self.assertEqual(len(text), read_config.MAX_FRONTMATTER_BYTES)
+        self.assertEqual(read_config.parse_frontmatter(text), {"a": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()